@@ -10,18 +10,617 @@ import bmesh
 import mathutils
 import random
 import json
+import copy
 import os
 import sys
 import math
+import hashlib
+import importlib.machinery
+import importlib.util
+import string
+import shutil
+import subprocess
+import numpy as np
 from pathlib import Path
-from mathutils import Vector, noise
+from types import MappingProxyType
+from mathutils import noise
+from mathutils.bvhtree import BVHTree
 from typing import Dict, List, Any, Optional, Tuple
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    from meshoptimizer import optimize_vertex_cache_fifo, optimize_vertex_fetch_remap, simplify, SIMPLIFY_LOCK_BORDER
+    MESHOPT_AVAILABLE = True
+except ImportError:
+    MESHOPT_AVAILABLE = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Predefined style profiles, built once at import
+_STYLE_PRESETS = MappingProxyType({
+    'volcanic_ashfall': {
+        'base_colors': {
+            'lava_rock': (0.15, 0.1, 0.08, 1.0),
+            'weathered_rock': (0.25, 0.18, 0.15, 1.0),
+            'ash_deposits': (0.35, 0.30, 0.25, 1.0),
+            'fresh_lava': (0.8, 0.2, 0.1, 1.0)
+        },
+        'roughness_ranges': {
+            'smooth_lava': (0.1, 0.3),
+            'rough_rock': (0.8, 0.95),
+            'ash_surface': (0.6, 0.8)
+        },
+        'wetness_logic': {
+            'low_areas': 0.4,  # Higher wetness in valleys
+            'slopes': 0.1,     # Dry on slopes
+            'peaks': 0.0       # Completely dry on peaks
+        },
+        'emission_strength': 0.02,  # Subtle volcanic glow
+        'height_zones': {
+            'lava_flow': (0.0, 0.3),      # Bottom 30%
+            'rocky_slopes': (0.3, 0.7),   # Middle slopes
+            'ash_peaks': (0.7, 1.0)       # Top peaks
+        }
+    },
+    'realistic_volcanic': {
+        'base_colors': {
+            'basalt': (0.12, 0.08, 0.06, 1.0),
+            'scoria': (0.3, 0.15, 0.1, 1.0),
+            'weathered': (0.4, 0.35, 0.25, 1.0)
+        },
+        'roughness_ranges': {
+            'polished_rock': (0.2, 0.4),
+            'rough_basalt': (0.85, 0.95)
+        },
+        'wetness_logic': {'uniform': 0.1},
+        'emission_strength': 0.0,
+        'height_zones': {
+            'flows': (0.0, 0.4),
+            'slopes': (0.4, 1.0)
+        }
+    }
+})
+
+# Scatter density multipliers per DENSITY_PRESET
+_DENSITY_PRESETS = MappingProxyType({'Low': 0.5, 'Med': 1.0, 'High': 2.0})
+
+# (scale, detail, roughness) rows of the main, medium and fine displacement noise layers
+# The Geometry Nodes lava-flow noise does not displace the surface, so it is not evaluated here
+_TERRAIN_NOISE_LAYERS = np.array([
+    (0.02, 8, 0.6),
+    (0.08, 6, 0.7),
+    (0.25, 4, 0.8)
+], dtype=np.float32)
+
+# Perlin permutation table (doubled to avoid index wrapping) and 2D gradient directions
+_PERM = np.tile(np.random.RandomState(0).permutation(256), 2).astype(np.uint8)
+_GRAD2 = np.array([[1, 1], [-1, 1], [1, -1], [-1, -1], [1, 0], [-1, 0], [0, 1], [0, -1]], dtype=np.int8)
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _perlin2d(x, y, perm, grad):
+        """Single-octave 2D gradient noise in roughly [-1, 1]"""
+        x0 = math.floor(x)
+        y0 = math.floor(y)
+        fx = x - x0
+        fy = y - y0
+        xi = int(x0) & 255
+        yi = int(y0) & 255
+        
+        # Smoothstep fade 3t^2 - 2t^3
+        u = fx * fx * (3.0 - 2.0 * fx)
+        v = fy * fy * (3.0 - 2.0 * fy)
+        
+        g00 = grad[perm[perm[xi] + yi] & 7]
+        g10 = grad[perm[perm[xi + 1] + yi] & 7]
+        g01 = grad[perm[perm[xi] + yi + 1] & 7]
+        g11 = grad[perm[perm[xi + 1] + yi + 1] & 7]
+        
+        n00 = g00[0] * fx + g00[1] * fy
+        n10 = g10[0] * (fx - 1.0) + g10[1] * fy
+        n01 = g01[0] * fx + g01[1] * (fy - 1.0)
+        n11 = g11[0] * (fx - 1.0) + g11[1] * (fy - 1.0)
+        
+        nx0 = n00 + u * (n10 - n00)
+        nx1 = n01 + u * (n11 - n01)
+        return nx0 + v * (nx1 - nx0)
+    
+    @njit(parallel=True, cache=True, fastmath=True)
+    def _fbm2d_numba(xs, ys, stack, layers, perm, grad):
+        """Evaluate every noise layer in one pass, writing stack[layer, i] in [-1, 1]"""
+        for i in prange(xs.size):
+            x = xs[i]
+            y = ys[i]
+            for layer in range(layers.shape[0]):
+                total = 0.0
+                norm = 0.0
+                amplitude = 1.0
+                frequency = layers[layer, 0]
+                rough = layers[layer, 2]
+                for _ in range(int(layers[layer, 1])):
+                    total += amplitude * _perlin2d(x * frequency, y * frequency, perm, grad)
+                    norm += amplitude
+                    amplitude *= rough
+                    frequency *= 2.0
+                stack[layer, i] = total / norm
+else:
+    _fbm2d_numba = None
+
+def _perlin2d_numpy(x: np.ndarray, y: np.ndarray, perm: np.ndarray, grad: np.ndarray) -> np.ndarray:
+    """Vectorized single-octave 2D gradient noise matching the JIT kernel"""
+    x0 = np.floor(x)
+    y0 = np.floor(y)
+    fx = x - x0
+    fy = y - y0
+    xi = x0.astype(np.int64) & 255
+    yi = y0.astype(np.int64) & 255
+    
+    # Smoothstep fade 3t^2 - 2t^3
+    u = fx * fx * (3.0 - 2.0 * fx)
+    v = fy * fy * (3.0 - 2.0 * fy)
+    
+    # Hash all four corners through the permutation table with fancy indexing
+    row0 = perm[xi].astype(np.int64)
+    row1 = perm[xi + 1].astype(np.int64)
+    g00 = grad[perm[row0 + yi] & 7]
+    g10 = grad[perm[row1 + yi] & 7]
+    g01 = grad[perm[row0 + yi + 1] & 7]
+    g11 = grad[perm[row1 + yi + 1] & 7]
+    
+    n00 = g00[:, 0] * fx + g00[:, 1] * fy
+    n10 = g10[:, 0] * (fx - 1.0) + g10[:, 1] * fy
+    n01 = g01[:, 0] * fx + g01[:, 1] * (fy - 1.0)
+    n11 = g11[:, 0] * (fx - 1.0) + g11[:, 1] * (fy - 1.0)
+    
+    nx0 = n00 + u * (n10 - n00)
+    nx1 = n01 + u * (n11 - n01)
+    return nx0 + v * (nx1 - nx0)
+
+def _fbm2d_numpy(xs, ys, stack, layers, perm, grad):
+    """NumPy fallback for the fused noise-stack kernel: one vectorized evaluation per octave"""
+    grad = grad.astype(np.float32)
+    for layer, (scale, detail, rough) in enumerate(layers.tolist()):
+        total = np.zeros(xs.size, dtype=np.float32)
+        norm = 0.0
+        amplitude = 1.0
+        frequency = scale
+        for _ in range(int(detail)):
+            total += amplitude * _perlin2d_numpy(xs * frequency, ys * frequency, perm, grad)
+            norm += amplitude
+            amplitude *= rough
+            frequency *= 2.0
+        stack[layer] = total / norm
+
+def runtime_pick(numba_impl, numpy_impl):
+    """Prefer the JIT-compiled implementation when Numba is installed"""
+    return numba_impl if numba_impl is not None else numpy_impl
+
+fbm2d = runtime_pick(_fbm2d_numba, _fbm2d_numpy)
+
+# Cython source for a heightfield kernel specialized to one grid size and noise configuration
+_SPECIALIZED_KERNEL_TEMPLATE = string.Template('''# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+from libc.math cimport floorf
+
+cdef inline float _perlin(float x, float y, const unsigned char[::1] perm,
+                          const signed char[:, ::1] grad) noexcept nogil:
+    cdef float x0 = floorf(x)
+    cdef float y0 = floorf(y)
+    cdef float fx = x - x0
+    cdef float fy = y - y0
+    cdef int xi = (<int>x0) & 255
+    cdef int yi = (<int>y0) & 255
+    cdef float u = fx * fx * (3.0 - 2.0 * fx)
+    cdef float v = fy * fy * (3.0 - 2.0 * fy)
+    cdef int h00 = perm[perm[xi] + yi] & 7
+    cdef int h10 = perm[perm[xi + 1] + yi] & 7
+    cdef int h01 = perm[perm[xi] + yi + 1] & 7
+    cdef int h11 = perm[perm[xi + 1] + yi + 1] & 7
+    cdef float n00 = grad[h00, 0] * fx + grad[h00, 1] * fy
+    cdef float n10 = grad[h10, 0] * (fx - 1.0) + grad[h10, 1] * fy
+    cdef float n01 = grad[h01, 0] * fx + grad[h01, 1] * (fy - 1.0)
+    cdef float n11 = grad[h11, 0] * (fx - 1.0) + grad[h11, 1] * (fy - 1.0)
+    cdef float nx0 = n00 + u * (n10 - n00)
+    cdef float nx1 = n01 + u * (n11 - n01)
+    return nx0 + v * (nx1 - nx0)
+
+def fill_stack(float[:, :, ::1] stack, float origin, float spacing,
+               const unsigned char[::1] perm, const signed char[:, ::1] grad):
+    cdef Py_ssize_t i, j
+    cdef float x, y, total
+    with nogil:
+        for j in range($resolution):
+            y = origin + j * spacing
+            for i in range($resolution):
+                x = origin + i * spacing
+$layer_code
+''')
+
+def _render_specialized_kernel(resolution: int, layers: np.ndarray) -> str:
+    """Render the kernel source with octave loops unrolled and noise constants inlined"""
+    indent = ' ' * 16
+    lines = []
+    for layer, (scale, detail, rough) in enumerate(layers.tolist()):
+        amplitudes = [rough ** octave for octave in range(int(detail))]
+        lines.append(f"{indent}total = 0.0")
+        for octave, amplitude in enumerate(amplitudes):
+            frequency = scale * 2.0 ** octave
+            lines.append(f"{indent}total = total + {amplitude!r} * _perlin(x * {frequency!r}, y * {frequency!r}, perm, grad)")
+        lines.append(f"{indent}stack[{layer}, j, i] = total * {1.0 / sum(amplitudes)!r}")
+    return _SPECIALIZED_KERNEL_TEMPLATE.substitute(resolution=resolution, layer_code='\n'.join(lines))
+
+def _load_specialized_kernel(resolution: int, layers: np.ndarray, cache_dir: Path):
+    """Compile the specialized kernel once per (resolution, noise configuration) and import it"""
+    # Keyed on the rendered source and compile flags, so template or flag edits never reuse a stale build
+    source_code = _render_specialized_kernel(resolution, layers)
+    compile_args = ['-O3', '-march=native', '-ffast-math']
+    config_hash = hashlib.sha1('\0'.join([source_code, *compile_args]).encode()).hexdigest()[:12]
+    module_name = f"_heightfield_{resolution}_{config_hash}"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Only an extension built for this interpreter's ABI counts as a cache hit
+    built = [cache_dir / f"{module_name}{suffix}" for suffix in importlib.machinery.EXTENSION_SUFFIXES]
+    built = [path for path in built if path.exists()]
+    if not built:
+        # Build tools are only needed on a cache miss
+        from Cython.Build import cythonize
+        from setuptools import Distribution, Extension
+        
+        source = cache_dir / f"{module_name}.pyx"
+        source.write_text(source_code)
+        extension = Extension(module_name, [str(source)], extra_compile_args=compile_args)
+        dist = Distribution({'name': module_name, 'ext_modules': cythonize([extension], quiet=True)})
+        build_ext = dist.get_command_obj('build_ext')
+        build_ext.build_lib = str(cache_dir)
+        build_ext.build_temp = str(cache_dir / 'build')
+        dist.run_command('build_ext')
+        built = [Path(build_ext.get_ext_fullpath(module_name))]
+    
+    spec = importlib.util.spec_from_file_location(module_name, built[0])
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.fill_stack
+
+def _purge_scene():
+    """Remove every object from the blend data without going through operators"""
+    remove = bpy.data.objects.remove
+    for obj in list(bpy.data.objects):
+        remove(obj, do_unlink=True)
+
+def _set_color_ramp_stops(color_ramp, positions: List[float], colors: List[Tuple[float, ...]]):
+    """Write ascending ColorRamp stops with one foreach_set per attribute"""
+    elements = color_ramp.elements
+    
+    # A new ramp starts with two elements; add the rest before the batch write
+    for position in positions[len(elements):]:
+        elements.new(position)
+    
+    elements.foreach_set("position", np.array(positions, dtype=np.float32))
+    elements.foreach_set("color", np.array(colors, dtype=np.float32).ravel())
+
+_VOLCANIC_SHADER_GROUP_NAME = "VolcanicSurface"
+
+def _volcanic_shader_group() -> bpy.types.ShaderNodeTree:
+    """Return the shared volcanic surface shader group, building it on first use"""
+    # Looked up by name each time: a held reference dies when the datablock is removed or a file is loaded
+    group = bpy.data.node_groups.get(_VOLCANIC_SHADER_GROUP_NAME)
+    if group is not None:
+        return group
+    
+    group = bpy.data.node_groups.new(name=_VOLCANIC_SHADER_GROUP_NAME, type='ShaderNodeTree')
+    nodes = group.nodes
+    links = group.links
+    
+    group.interface.new_socket(name="Base Color", socket_type='NodeSocketColor', in_out='INPUT')
+    group.interface.new_socket(name="Roughness", socket_type='NodeSocketFloat', in_out='INPUT')
+    group.interface.new_socket(name="Emission Color", socket_type='NodeSocketColor', in_out='INPUT')
+    group.interface.new_socket(name="Emission Strength", socket_type='NodeSocketFloat', in_out='INPUT')
+    group.interface.new_socket(name="Shader", socket_type='NodeSocketShader', in_out='OUTPUT')
+    
+    input_node = nodes.new(type='NodeGroupInput')
+    output_node = nodes.new(type='NodeGroupOutput')
+    
+    # === SURFACE DETAIL TEXTURES ===
+    tex_coord = nodes.new(type='ShaderNodeTexCoord')
+    mapping = nodes.new(type='ShaderNodeMapping')
+    links.new(tex_coord.outputs['Generated'], mapping.inputs['Vector'])
+    
+    # Large, medium and fine rock detail
+    detail_noises = []
+    for scale, detail, roughness in ((8.0, 6.0, 0.7), (25.0, 4.0, 0.8), (100.0, 2.0, 0.9)):
+        noise_tex = nodes.new(type='ShaderNodeTexNoise')
+        noise_tex.inputs['Scale'].default_value = scale
+        noise_tex.inputs['Detail'].default_value = detail
+        noise_tex.inputs['Roughness'].default_value = roughness
+        links.new(mapping.outputs['Vector'], noise_tex.inputs['Vector'])
+        detail_noises.append(noise_tex)
+    noise_large, noise_medium, noise_fine = detail_noises
+    
+    # === TEXTURE MIXING ===
+    mix_large_medium = nodes.new(type='ShaderNodeMixRGB')
+    mix_large_medium.blend_type = 'MULTIPLY'
+    mix_large_medium.inputs['Fac'].default_value = 0.5
+    
+    mix_final = nodes.new(type='ShaderNodeMixRGB')
+    mix_final.blend_type = 'OVERLAY'
+    mix_final.inputs['Fac'].default_value = 0.3
+    
+    mix_height_color = nodes.new(type='ShaderNodeMixRGB')
+    mix_height_color.blend_type = 'MULTIPLY'
+    mix_height_color.inputs['Fac'].default_value = 0.8
+    
+    links.new(noise_large.outputs['Color'], mix_large_medium.inputs['Color1'])
+    links.new(noise_medium.outputs['Color'], mix_large_medium.inputs['Color2'])
+    links.new(mix_large_medium.outputs['Color'], mix_final.inputs['Color1'])
+    links.new(noise_fine.outputs['Color'], mix_final.inputs['Color2'])
+    links.new(input_node.outputs['Base Color'], mix_height_color.inputs['Color1'])
+    links.new(mix_final.outputs['Color'], mix_height_color.inputs['Color2'])
+    
+    # === PBR SURFACE ===
+    principled = nodes.new(type='ShaderNodeBsdfPrincipled')
+    principled.inputs['Metallic'].default_value = 0.05  # Low for rocks
+    links.new(mix_height_color.outputs['Color'], principled.inputs['Base Color'])
+    links.new(input_node.outputs['Roughness'], principled.inputs['Roughness'])
+    
+    normal_map = nodes.new(type='ShaderNodeNormalMap')
+    links.new(mix_final.outputs['Color'], normal_map.inputs['Color'])
+    links.new(normal_map.outputs['Normal'], principled.inputs['Normal'])
+    
+    # === EMISSION FOR VOLCANIC GLOW ===
+    # Subtle 5% glow, switched off entirely when the strength input is zero
+    emission = nodes.new(type='ShaderNodeEmission')
+    links.new(input_node.outputs['Emission Color'], emission.inputs['Color'])
+    links.new(input_node.outputs['Emission Strength'], emission.inputs['Strength'])
+    
+    glow_enabled = nodes.new(type='ShaderNodeMath')
+    glow_enabled.operation = 'GREATER_THAN'
+    glow_enabled.inputs[1].default_value = 0.0
+    links.new(input_node.outputs['Emission Strength'], glow_enabled.inputs[0])
+    
+    glow_fac = nodes.new(type='ShaderNodeMath')
+    glow_fac.operation = 'MULTIPLY'
+    glow_fac.inputs[1].default_value = 0.05
+    links.new(glow_enabled.outputs['Value'], glow_fac.inputs[0])
+    
+    mix_shader = nodes.new(type='ShaderNodeMixShader')
+    links.new(glow_fac.outputs['Value'], mix_shader.inputs['Fac'])
+    links.new(principled.outputs['BSDF'], mix_shader.inputs[1])
+    links.new(emission.outputs['Emission'], mix_shader.inputs[2])
+    links.new(mix_shader.outputs['Shader'], output_node.inputs['Shader'])
+    
+    return group
+
+def _foreach_get_array(collection, attribute: str, width: int = 1, dtype=np.float32) -> np.ndarray:
+    """Read one attribute of a bpy collection into a contiguous (N,) or (N, width) array"""
+    flat = np.empty(len(collection) * width, dtype=dtype)
+    collection.foreach_get(attribute, flat)
+    return flat if width == 1 else flat.reshape(-1, width)
+
+def _mesh_verts_np(mesh: bpy.types.Mesh) -> np.ndarray:
+    """Mesh vertex positions as an (N, 3) float32 array"""
+    return _foreach_get_array(mesh.vertices, "co", 3)
+
+def _set_world_matrices(objects, matrices: np.ndarray):
+    """Assign (N, 4, 4) row-major world matrices to an object collection in one foreach_set"""
+    # Blender stores matrices column-major, so transpose before flattening
+    flat = np.ascontiguousarray(matrices.transpose(0, 2, 1), dtype=np.float32).ravel()
+    objects.foreach_set("matrix_world", flat)
+
+def _build_quad_indices(resolution: int) -> np.ndarray:
+    """Counter-clockwise quad vertex indices for a row-major (rows=Y, cols=X) vertex grid"""
+    rows = np.arange(resolution - 1, dtype=np.int32)[:, None] * resolution
+    cols = np.arange(resolution - 1, dtype=np.int32)[None, :]
+    corner = (rows + cols).ravel()
+    return np.stack([corner, corner + 1, corner + resolution + 1, corner + resolution], axis=-1)
+
+def _triangulate_quads(quads: np.ndarray) -> np.ndarray:
+    """Split (N, 4) quads into (2N, 3) triangles along the 0-2 diagonal, keeping winding"""
+    return quads[:, [0, 1, 2, 0, 2, 3]].reshape(-1, 3)
+
+def _optimize_triangle_layout(verts: np.ndarray, triangles: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Reorder triangles for post-transform cache hits, then vertices for fetch locality"""
+    vertex_count = len(verts)
+    indices = np.ascontiguousarray(triangles, dtype=np.uint32).ravel()
+    
+    ordered = np.empty_like(indices)
+    optimize_vertex_cache_fifo(ordered, indices, vertex_count=vertex_count, cache_size=16)
+    
+    # Every vertex is referenced, so the fetch remap is a full permutation
+    remap = np.empty(vertex_count, dtype=np.uint32)
+    optimize_vertex_fetch_remap(remap, ordered, vertex_count=vertex_count)
+    
+    remapped_verts = np.empty_like(verts)
+    remapped_verts[remap] = verts
+    return remapped_verts, remap[ordered].astype(np.int32).reshape(-1, 3)
+
+def _morton_order_layout(verts: np.ndarray, faces: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Reorder vertices along a Z-order curve over XY, then faces by their lowest vertex index"""
+    xy = verts[:, :2].astype(np.float64)
+    low = xy.min(axis=0)
+    span = np.maximum(xy.max(axis=0) - low, 1e-12)
+    quantized = ((xy - low) / span * 65535).astype(np.uint32)
+    
+    # Interleave the 16-bit X and Y coordinates into one 32-bit Morton code
+    spread = quantized.copy()
+    for shift, mask in ((8, 0x00FF00FF), (4, 0x0F0F0F0F), (2, 0x33333333), (1, 0x55555555)):
+        spread = (spread | (spread << shift)) & mask
+    codes = spread[:, 0] | (spread[:, 1] << 1)
+    
+    order = np.argsort(codes, kind='stable')
+    remap = np.empty_like(order)
+    remap[order] = np.arange(len(order))
+    faces = remap[faces]
+    faces = faces[np.argsort(faces.min(axis=1), kind='stable')]
+    return verts[order], faces.astype(np.int32)
+
+def _simplify_triangles(verts: np.ndarray, triangles: np.ndarray,
+                        ratio: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Quadric-error simplify a triangle mesh to about ratio of its triangles, keeping the outer border"""
+    indices = np.ascontiguousarray(triangles, dtype=np.uint32).ravel()
+    target_index_count = max(3, int(len(indices) * ratio) // 3 * 3)
+    
+    # Error bound relaxed so the target count, not the error, stops the collapse
+    simplified = np.empty_like(indices)
+    index_count = simplify(simplified, indices, np.ascontiguousarray(verts, dtype=np.float32),
+                           target_index_count=target_index_count, target_error=1.0,
+                           options=SIMPLIFY_LOCK_BORDER)
+    
+    # Drop vertices no longer referenced by any triangle
+    used, compact = np.unique(simplified[:index_count], return_inverse=True)
+    return verts[used], compact.astype(np.int32).reshape(-1, 3)
+
+def _mesh_from_faces(name: str, verts: np.ndarray, faces: np.ndarray) -> bpy.types.Mesh:
+    """Build a mesh from (V, 3) vertices and (F, corners) faces with foreach_set"""
+    corners = faces.shape[1]
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(verts))
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(verts, dtype=np.float32).ravel())
+    mesh.loops.add(faces.size)
+    mesh.polygons.add(len(faces))
+    mesh.polygons.foreach_set("loop_start", np.arange(0, faces.size, corners, dtype=np.int32))
+    mesh.polygons.foreach_set("vertices", faces.ravel())
+    mesh.update(calc_edges=True)
+    return mesh
+
+def _instance_matrices(positions: np.ndarray, normals: np.ndarray,
+                       z_rotations: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """Build (N, 4, 4) world matrices aligning each instance's up axis to its terrain normal"""
+    count = len(positions)
+    normals = normals / np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-8)
+    nx, ny, nz = normals[:, 0], normals[:, 1], normals[:, 2]
+    
+    # Rodrigues rotation taking +Z onto the normal (axis = up x normal)
+    vx, vy = -ny, nx
+    k = 1.0 / np.maximum(1.0 + nz, 1e-8)
+    align = np.empty((count, 3, 3), dtype=np.float32)
+    align[:, 0, 0] = 1 - k * vy * vy
+    align[:, 0, 1] = k * vx * vy
+    align[:, 0, 2] = vy
+    align[:, 1, 0] = k * vx * vy
+    align[:, 1, 1] = 1 - k * vx * vx
+    align[:, 1, 2] = -vx
+    align[:, 2, 0] = -vy
+    align[:, 2, 1] = vx
+    align[:, 2, 2] = nz
+    
+    # The closed form is exact everywhere except antiparallel normals; flip those about X
+    align[nz <= -0.999] = np.diag(np.array([1.0, -1.0, -1.0], dtype=np.float32))
+    
+    # Random spin about the instance's own up axis
+    cos_r, sin_r = np.cos(z_rotations), np.sin(z_rotations)
+    spin = np.zeros((count, 3, 3), dtype=np.float32)
+    spin[:, 0, 0] = cos_r
+    spin[:, 0, 1] = -sin_r
+    spin[:, 1, 0] = sin_r
+    spin[:, 1, 1] = cos_r
+    spin[:, 2, 2] = 1.0
+    
+    matrices = np.tile(np.eye(4, dtype=np.float32), (count, 1, 1))
+    matrices[:, :3, :3] = (align @ spin) * scales[:, None, None]
+    matrices[:, :3, 3] = positions
+    return matrices
+
+def _poisson_disk_mask(points: np.ndarray, radius: float,
+                       priority: Optional[np.ndarray] = None) -> np.ndarray:
+    """Select a blue-noise subset of candidate points with no two closer than radius
+    
+    Same result as greedy acceptance in ascending priority order (input order by default),
+    resolved in parallel rounds so no spatial ordering biases the density.
+    """
+    count = len(points)
+    if not count:
+        return np.zeros(0, dtype=bool)
+    order = np.arange(count) if priority is None else np.argsort(priority, kind='stable')
+    rank = np.empty(count, dtype=np.float64)
+    rank[order] = np.arange(count)
+    
+    # Cells of radius/sqrt(2) hold at most one accepted point; conflicts reach 2 cells away
+    cell = radius / math.sqrt(2)
+    ij = np.floor((points - points.min(axis=0)) / cell).astype(np.int64)
+    grid_x, grid_y = ij.max(axis=0) + 1
+    keys = ij[:, 0] * grid_y + ij[:, 1]
+    
+    # Candidates grouped by cell, best priority first; any two candidates of one cell conflict
+    by_cell = np.lexsort((rank, keys))
+    cell_keys, cell_start, cell_size = np.unique(keys[by_cell], return_index=True, return_counts=True)
+    cell_count = len(cell_keys)
+    cell_end = cell_start + cell_size
+    head = cell_start.copy()  # Best undecided candidate of each cell; cell_end once the cell is resolved
+    
+    # Cell -> neighbouring cells lookup, padded by 2 cells; index cell_count is an empty sentinel cell
+    grid = np.full((grid_x + 4, grid_y + 4), cell_count, dtype=np.int64)
+    cx, cy = cell_keys // grid_y + 2, cell_keys % grid_y + 2
+    grid[cx, cy] = np.arange(cell_count)
+    offsets = [(dx, dy) for dx in range(-2, 3) for dy in range(-2, 3) if dx or dy]
+    neighbour_cells = np.stack([grid[cx + dx, cy + dy] for dx, dy in offsets], axis=1)
+    
+    # Sorted-order arrays with a trailing sentinel slot (index count) that never conflicts or wins
+    sorted_points = np.vstack([points[by_cell].astype(np.float64), np.full((1, 2), np.inf)])
+    sorted_rank = np.append(rank[by_cell], np.inf)
+    accepted_at = np.full(cell_count + 1, count, dtype=np.int64)
+    
+    # The best undecided candidate overall is always resolved, so every round makes progress
+    live = np.arange(cell_count)
+    while len(live):
+        active = head[live]
+        
+        # Reject heads conflicting with a point already accepted in a neighbouring cell
+        offsets_to_accepted = sorted_points[accepted_at[neighbour_cells[live]]] - sorted_points[active][:, None]
+        blocked = ((offsets_to_accepted ** 2).sum(axis=2) < radius * radius).any(axis=1)
+        head[live[blocked]] += 1
+        
+        # Accept heads once no neighbouring cell still holds an undecided better-priority candidate
+        current = np.append(np.where(head < cell_end, head, count), count)
+        wins = ~blocked & (sorted_rank[current[neighbour_cells[live]]] > sorted_rank[active][:, None]).all(axis=1)
+        accepted_at[live[wins]] = active[wins]
+        head[live[wins]] = cell_end[live[wins]]
+        
+        live = live[head[live] < cell_end[live]]
+    
+    accepted = np.zeros(count, dtype=bool)
+    accepted_sorted = accepted_at[:cell_count]
+    accepted[by_cell[accepted_sorted[accepted_sorted < count]]] = True
+    return accepted
+
+def _sample_heightfield(grid: np.ndarray, origin: Tuple[float, float], spacing: float,
+                        points: np.ndarray, height_scale: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Bilinearly sample heights and surface normals from a regular (rows=Y, cols=X) heightfield
+    
+    Quantized grids are dequantized per sampled corner as grid * height_scale.
+    """
+    rows, cols = grid.shape
+    fx = np.clip((points[:, 0] - origin[0]) / spacing, 0, cols - 1)
+    fy = np.clip((points[:, 1] - origin[1]) / spacing, 0, rows - 1)
+    ix = np.minimum(fx.astype(np.int64), cols - 2)
+    iy = np.minimum(fy.astype(np.int64), rows - 2)
+    tx = (fx - ix).astype(np.float32)
+    ty = (fy - iy).astype(np.float32)
+    
+    h00 = grid[iy, ix].astype(np.float32) * height_scale
+    h10 = grid[iy, ix + 1].astype(np.float32) * height_scale
+    h01 = grid[iy + 1, ix].astype(np.float32) * height_scale
+    h11 = grid[iy + 1, ix + 1].astype(np.float32) * height_scale
+    
+    heights = (h00 * (1 - tx) * (1 - ty) + h10 * tx * (1 - ty) +
+               h01 * (1 - tx) * ty + h11 * tx * ty)
+    
+    # Analytic gradient of the bilinear patch gives the surface normal
+    normals = np.empty((len(points), 3), dtype=np.float32)
+    normals[:, 0] = -((h10 - h00) * (1 - ty) + (h11 - h01) * ty) / spacing
+    normals[:, 1] = -((h01 - h00) * (1 - tx) + (h11 - h10) * tx) / spacing
+    normals[:, 2] = 1.0
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+    
+    return heights, normals
+
 class TerrainConfig:
     """Configuration and validation system for terrain generation"""
     
@@ -104,54 +703,11 @@ class TerrainConfig:
     
     def _get_style_preset(self, preset_name: str) -> Dict[str, Any]:
         """Get predefined style profiles"""
-        presets = {
-            'volcanic_ashfall': {
-                'base_colors': {
-                    'lava_rock': (0.15, 0.1, 0.08, 1.0),
-                    'weathered_rock': (0.25, 0.18, 0.15, 1.0),
-                    'ash_deposits': (0.35, 0.30, 0.25, 1.0),
-                    'fresh_lava': (0.8, 0.2, 0.1, 1.0)
-                },
-                'roughness_ranges': {
-                    'smooth_lava': (0.1, 0.3),
-                    'rough_rock': (0.8, 0.95),
-                    'ash_surface': (0.6, 0.8)
-                },
-                'wetness_logic': {
-                    'low_areas': 0.4,  # Higher wetness in valleys
-                    'slopes': 0.1,     # Dry on slopes
-                    'peaks': 0.0       # Completely dry on peaks
-                },
-                'emission_strength': 0.02,  # Subtle volcanic glow
-                'height_zones': {
-                    'lava_flow': (0.0, 0.3),      # Bottom 30%
-                    'rocky_slopes': (0.3, 0.7),   # Middle slopes
-                    'ash_peaks': (0.7, 1.0)       # Top peaks
-                }
-            },
-            'realistic_volcanic': {
-                'base_colors': {
-                    'basalt': (0.12, 0.08, 0.06, 1.0),
-                    'scoria': (0.3, 0.15, 0.1, 1.0),
-                    'weathered': (0.4, 0.35, 0.25, 1.0)
-                },
-                'roughness_ranges': {
-                    'polished_rock': (0.2, 0.4),
-                    'rough_basalt': (0.85, 0.95)
-                },
-                'wetness_logic': {'uniform': 0.1},
-                'emission_strength': 0.0,
-                'height_zones': {
-                    'flows': (0.0, 0.4),
-                    'slopes': (0.4, 1.0)
-                }
-            }
-        }
-        
-        if preset_name not in presets:
-            raise ValueError(f"Unknown style preset: {preset_name}. Available: {list(presets.keys())}")
-        
-        return presets[preset_name]
+        # The preset table is shared, so each config gets its own mutable copy
+        try:
+            return copy.deepcopy(_STYLE_PRESETS[preset_name])
+        except KeyError:
+            raise ValueError(f"Unknown style preset: {preset_name}. Available: {list(_STYLE_PRESETS.keys())}")
 
 class VolcanicTerrainGenerator:
     """Main terrain generation class using Geometry Nodes"""
@@ -161,9 +717,32 @@ class VolcanicTerrainGenerator:
         self.terrain_object = None
         self.collision_object = None
         self.scattered_objects = []
-        
-        # Set deterministic seed
+        self.scattered_instance_count = 0
+        self._asset_cache: Dict[str, List[bpy.types.Object]] = {}
+        self._asset_collections: Dict[str, bpy.types.Collection] = {}
+        self._templates_collection: Optional[bpy.types.Collection] = None
+        self._export_collection: Optional[bpy.types.Collection] = None
+        
+        # Regular int16-quantized heightfield used for fast scatter sampling (rows=Y, cols=X)
+        self._heightmap: Optional[np.ndarray] = None
+        self._heightmap_origin = (0.0, 0.0)
+        self._heightmap_spacing = 1.0
+        self._heightmap_scale = 1.0
+        
+        # BVH over the evaluated terrain plus its (4, 4) world transforms, for rasterizing without a heightfield
+        self._terrain_bvh: Optional[BVHTree] = None
+        self._terrain_matrix: Optional[np.ndarray] = None
+        self._terrain_matrix_inv: Optional[np.ndarray] = None
+        
+        # Per-cell (between four heightmap samples) height bounds and max slope in degrees,
+        # used to restrict scatter candidates to cells that satisfy an asset's rules
+        self._cell_height_min: Optional[np.ndarray] = None
+        self._cell_height_max: Optional[np.ndarray] = None
+        self._slope_grid: Optional[np.ndarray] = None
+        
+        # Set deterministic seed; all scatter randomness draws from one PCG64 stream
         random.seed(config.config['RNG_SEED'])
+        self.rng = np.random.default_rng(config.config['RNG_SEED'])
         
         # Configure Blender scene
         self._setup_scene()
@@ -171,22 +750,23 @@ class VolcanicTerrainGenerator:
     def _setup_scene(self):
         """Configure Blender scene for terrain generation"""
         # Clear existing mesh objects
-        bpy.ops.object.select_all(action='SELECT')
-        bpy.ops.object.delete(use_global=False, confirm=False)
+        _purge_scene()
+        
+        scene = bpy.context.scene
         
         # Set units to meters
-        bpy.context.scene.unit_settings.system = 'METRIC'
-        bpy.context.scene.unit_settings.scale_length = 1.0
+        scene.unit_settings.system = 'METRIC'
+        scene.unit_settings.scale_length = 1.0
         
         # Configure render engine
         engine = self.config.config['RENDER_ENGINE']
         if engine == 'Eevee-Next':
-            bpy.context.scene.render.engine = 'BLENDER_EEVEE_NEXT'
+            scene.render.engine = 'BLENDER_EEVEE_NEXT'
         elif engine == 'Cycles':
-            bpy.context.scene.render.engine = 'CYCLES'
+            scene.render.engine = 'CYCLES'
         else:
             logger.warning(f"Unknown render engine: {engine}, using Eevee-Next")
-            bpy.context.scene.render.engine = 'BLENDER_EEVEE_NEXT'
+            scene.render.engine = 'BLENDER_EEVEE_NEXT'
         
         # Setup world/sky
         self._setup_world()
@@ -250,24 +830,37 @@ class VolcanicTerrainGenerator:
         links.new(background.outputs['Background'], output.inputs['Surface'])
     
     def generate_terrain(self):
-        """Generate main terrain using Geometry Nodes"""
-        logger.info("Generating volcanic terrain with Geometry Nodes...")
-        
-        # Create base plane
+        """Generate main terrain from a baked heightfield, or Geometry Nodes as a preview"""
+        cfg = self.config.config
         size_x, size_y = self.config.map_size
-        bpy.ops.mesh.primitive_plane_add(size=max(size_x, size_y), location=(0, 0, 0))
-        self.terrain_object = bpy.context.active_object
-        self.terrain_object.name = f"{self.config.config['PROJECT_NAME']}_Terrain"
-        
-        # Create Geometry Nodes modifier
-        geo_nodes_mod = self.terrain_object.modifiers.new(name="TerrainGeneration", type='NODES')
-        
-        # Create custom node group for volcanic terrain
-        node_group = self._create_volcanic_terrain_nodes()
-        geo_nodes_mod.node_group = node_group
-        
-        # Configure parameters
-        self._configure_terrain_parameters(geo_nodes_mod)
+        size = max(size_x, size_y)
+        resolution = cfg.get('HEIGHTFIELD_RESOLUTION', 513)
+        use_geometry_nodes = cfg.get('GEOMETRY_NODES_PREVIEW', False)
+        
+        if use_geometry_nodes:
+            logger.info("Generating volcanic terrain with Geometry Nodes...")
+            heights = None
+            self._heightmap = None  # Displacement happens in the modifier; sample the evaluated mesh
+        else:
+            logger.info("Generating volcanic terrain from baked heightfield...")
+            heights = self._generate_heightmap(size, resolution)
+        
+        # Build the grid mesh straight from NumPy buffers
+        mesh = self._create_grid_mesh(f"{cfg['PROJECT_NAME']}_Terrain", size, resolution, heights)
+        self.terrain_object = bpy.data.objects.new(mesh.name, mesh)
+        self._invalidate_scatter_caches()
+        bpy.context.collection.objects.link(self.terrain_object)
+        
+        if use_geometry_nodes:
+            # Create Geometry Nodes modifier
+            geo_nodes_mod = self.terrain_object.modifiers.new(name="TerrainGeneration", type='NODES')
+            
+            # Create custom node group for volcanic terrain
+            node_group = self._create_volcanic_terrain_nodes()
+            geo_nodes_mod.node_group = node_group
+            
+            # Configure parameters
+            self._configure_terrain_parameters(geo_nodes_mod)
         
         # Apply advanced volcanic materials
         self._create_volcanic_materials()
@@ -275,6 +868,79 @@ class VolcanicTerrainGenerator:
         logger.info("✓ Volcanic terrain generated")
         return self.terrain_object
     
+    def _create_grid_mesh(self, name: str, size: float, resolution: int,
+                          heights: Optional[np.ndarray] = None) -> bpy.types.Mesh:
+        """Create a square quad-grid mesh of resolution^2 vertices, optionally displaced by heights"""
+        axis = np.linspace(-size/2, size/2, resolution, dtype=np.float32)
+        grid_x, grid_y = np.meshgrid(axis, axis)
+        grid_z = heights if heights is not None else np.zeros_like(grid_x)
+        verts = np.stack([grid_x, grid_y, grid_z], axis=-1).astype(np.float32).reshape(-1, 3)
+        faces = _build_quad_indices(resolution)
+        
+        # Optionally ship a pre-triangulated, GPU cache-ordered index/vertex buffer
+        if self.config.config.get('OPTIMIZE_MESH_LAYOUT', False):
+            if MESHOPT_AVAILABLE:
+                verts, faces = _optimize_triangle_layout(verts, _triangulate_quads(faces))
+            else:
+                verts, faces = _morton_order_layout(verts, faces)
+        
+        mesh = _mesh_from_faces(name, verts, faces)
+        
+        # Planar UVs spanning the full terrain extent
+        uv_layer = mesh.uv_layers.new(name="UVMap")
+        loop_xy = verts[faces.ravel(), :2]
+        uv_layer.data.foreach_set("uv", ((loop_xy + size/2) / size).ravel())
+        return mesh
+    
+    def _generate_heightmap(self, size: float, resolution: int) -> np.ndarray:
+        """Evaluate the layered noise on the terrain grid and cache it for scatter sampling"""
+        height = self._terrain_parameters()['height']
+        
+        stack = None
+        if self.config.config.get('COMPILE_HEIGHTFIELD_KERNEL', False):
+            stack = self._evaluate_specialized_noise_stack(size, resolution)
+        if stack is None:
+            axis = np.linspace(-size/2, size/2, resolution, dtype=np.float32)
+            grid_x, grid_y = np.meshgrid(axis, axis)
+            stack = self._evaluate_noise_stack(grid_x.ravel(), grid_y.ravel())
+        heights = self._stack_to_height(stack, height).reshape(resolution, resolution)
+        self._store_heightmap(heights, size)
+        return heights
+    
+    def _store_heightmap(self, heights: np.ndarray, size: float):
+        """Cache a square (rows=Y, cols=X) height grid centred on the origin for scatter sampling"""
+        resolution = heights.shape[0]
+        
+        # Scatter lookups only need ~mm precision, so keep an int16 copy; float32 stays for the mesh
+        max_height = max(float(np.abs(heights).max()), 1e-6)
+        self._heightmap_scale = max_height / 32767.0
+        self._heightmap = np.round(heights / self._heightmap_scale).astype(np.int16)
+        self._heightmap_origin = (-size/2, -size/2)
+        self._heightmap_spacing = size / (resolution - 1)
+    
+    def _evaluate_noise_stack(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Evaluate all terrain noise layers into one contiguous (layers, N) float32 buffer"""
+        stack = np.empty((len(_TERRAIN_NOISE_LAYERS), xs.size), dtype=np.float32)
+        fbm2d(xs, ys, stack, _TERRAIN_NOISE_LAYERS, _PERM, _GRAD2)
+        return stack
+    
+    def _evaluate_specialized_noise_stack(self, size: float, resolution: int) -> Optional[np.ndarray]:
+        """Evaluate the grid noise stack with a Cython kernel compiled for this exact configuration"""
+        cache_dir = Path(self.config.config.get('KERNEL_CACHE_DIR', Path.home() / '.cache' / 'volcanic_terrain'))
+        try:
+            fill_stack = _load_specialized_kernel(resolution, _TERRAIN_NOISE_LAYERS, cache_dir)
+        except Exception as e:
+            logger.warning(f"Specialized heightfield kernel unavailable, using generic kernel: {e}")
+            return None
+        
+        stack = np.empty((len(_TERRAIN_NOISE_LAYERS), resolution, resolution), dtype=np.float32)
+        fill_stack(stack, -size/2, size / (resolution - 1), _PERM, _GRAD2)
+        return stack.reshape(len(_TERRAIN_NOISE_LAYERS), -1)
+    
+    def _stack_to_height(self, stack: np.ndarray, height: float) -> np.ndarray:
+        """Combine displacement layers like the Geometry Nodes chain: sum of [0, 1] factors times height"""
+        return (0.5 * len(stack) + 0.5 * stack.sum(axis=0)) * height
+    
     def _create_volcanic_terrain_nodes(self):
         """Create Geometry Nodes setup for volcanic terrain generation"""
         # Create new node group
@@ -310,10 +976,6 @@ class VolcanicTerrainGenerator:
         nodes = node_group.nodes
         links = node_group.links
         
-        # Base subdivision for detail
-        subdivide = nodes.new(type='GeometryNodeSubdivisionSurface')
-        subdivide.inputs['Level'].default_value = 3  # Lower level for Catmull-Clark
-        
         # Position input for sampling
         position = nodes.new(type='GeometryNodeInputPosition')
         
@@ -373,8 +1035,7 @@ class VolcanicTerrainGenerator:
         
         # === NODE CONNECTIONS ===
         # Basic mesh flow
-        links.new(input_node.outputs['Geometry'], subdivide.inputs['Mesh'])
-        links.new(subdivide.outputs['Mesh'], set_position.inputs['Geometry'])
+        links.new(input_node.outputs['Geometry'], set_position.inputs['Geometry'])
         
         # Position sampling
         links.new(position.outputs['Position'], noise_main.inputs['Vector'])
@@ -403,7 +1064,6 @@ class VolcanicTerrainGenerator:
         
         # Position nodes for better layout
         input_node.location = (-800, 0)
-        subdivide.location = (-600, 0)
         position.location = (-600, -200)
         noise_main.location = (-400, -100)
         noise_medium.location = (-400, -250)
@@ -416,27 +1076,38 @@ class VolcanicTerrainGenerator:
         set_position.location = (600, 0)
         output_node.location = (800, 0)
     
-    def _configure_terrain_parameters(self, geo_nodes_mod):
-        """Configure terrain generation parameters"""
+    def _terrain_parameters(self) -> Dict[str, Any]:
+        """Derive terrain generation parameters from map size and density preset"""
         # Get density multiplier from preset
-        density_presets = {'Low': 0.5, 'Med': 1.0, 'High': 2.0}
-        density_mult = density_presets.get(self.config.config['DENSITY_PRESET'], 1.0)
+        density_mult = _DENSITY_PRESETS.get(self.config.config['DENSITY_PRESET'], 1.0)
         
         # Configure based on map size and style
-        map_area = self.config.map_size[0] * self.config.map_size[1]
-        height_scale = max(10, map_area * 0.00005 * density_mult)  # Scale with map size
+        size_x, size_y = self.config.map_size
+        map_area = size_x * size_y
+        
+        return {
+            'scale': 25.0,
+            'height': max(10, map_area * 0.00005 * density_mult),  # Scale with map size
+            'crater_count': max(1, int(map_area * 0.000008 * density_mult)),
+            'lava_flow_strength': 0.7,
+            'erosion_amount': 0.3
+        }
+    
+    def _configure_terrain_parameters(self, geo_nodes_mod):
+        """Configure terrain generation parameters"""
+        params = self._terrain_parameters()
         
         # Set modifier parameters if they exist
         if "Scale" in geo_nodes_mod:
-            geo_nodes_mod["Scale"] = 25.0
+            geo_nodes_mod["Scale"] = params['scale']
         if "Height" in geo_nodes_mod:
-            geo_nodes_mod["Height"] = height_scale
+            geo_nodes_mod["Height"] = params['height']
         if "Crater Count" in geo_nodes_mod:
-            geo_nodes_mod["Crater Count"] = max(1, int(map_area * 0.000008 * density_mult))
+            geo_nodes_mod["Crater Count"] = params['crater_count']
         if "Lava Flow Strength" in geo_nodes_mod:
-            geo_nodes_mod["Lava Flow Strength"] = 0.7
+            geo_nodes_mod["Lava Flow Strength"] = params['lava_flow_strength']
         if "Erosion Amount" in geo_nodes_mod:
-            geo_nodes_mod["Erosion Amount"] = 0.3
+            geo_nodes_mod["Erosion Amount"] = params['erosion_amount']
     
     def _create_volcanic_materials(self):
         """Create advanced PBR volcanic materials with height-based blending"""
@@ -452,13 +1123,14 @@ class VolcanicTerrainGenerator:
         nodes.clear()
         
         # === MAIN SHADER NODES ===
+        # Detail noise, mixing and PBR wiring live in one shared group so every
+        # material reuses the same compiled graph
         output = nodes.new(type='ShaderNodeOutputMaterial')
-        principled = nodes.new(type='ShaderNodeBsdfPrincipled')
+        surface = nodes.new(type='ShaderNodeGroup')
+        surface.node_tree = _volcanic_shader_group()
         
-        # === GEOMETRY AND TEXTURE COORDINATE INPUTS ===
+        # === GEOMETRY INPUTS ===
         geometry = nodes.new(type='ShaderNodeNewGeometry')
-        tex_coord = nodes.new(type='ShaderNodeTexCoord')
-        mapping = nodes.new(type='ShaderNodeMapping')
         
         # === HEIGHT-BASED MATERIAL ZONES ===
         # Get style profile colors
@@ -473,38 +1145,12 @@ class VolcanicTerrainGenerator:
         color_ramp_main = nodes.new(type='ShaderNodeValToRGB')
         
         # Configure height-based color zones
-        elements = color_ramp_main.color_ramp.elements
-        elements[0].position = 0.0
-        elements[0].color = colors['lava_rock']
-        
-        # Add intermediate color stops
-        elements.new(0.4)
-        elements[1].color = colors['weathered_rock']
-        
-        elements.new(0.7)
-        elements[2].color = colors['ash_deposits']
-        
-        elements[1].position = 1.0
-        elements[1].color = colors.get('fresh_lava', colors['lava_rock'])
-        
-        # === SURFACE DETAIL TEXTURES ===
-        # Large-scale rock texture
-        noise_large = nodes.new(type='ShaderNodeTexNoise')
-        noise_large.inputs['Scale'].default_value = 8.0
-        noise_large.inputs['Detail'].default_value = 6.0
-        noise_large.inputs['Roughness'].default_value = 0.7
-        
-        # Medium detail for variation
-        noise_medium = nodes.new(type='ShaderNodeTexNoise')
-        noise_medium.inputs['Scale'].default_value = 25.0
-        noise_medium.inputs['Detail'].default_value = 4.0
-        noise_medium.inputs['Roughness'].default_value = 0.8
-        
-        # Fine surface detail
-        noise_fine = nodes.new(type='ShaderNodeTexNoise')
-        noise_fine.inputs['Scale'].default_value = 100.0
-        noise_fine.inputs['Detail'].default_value = 2.0
-        noise_fine.inputs['Roughness'].default_value = 0.9
+        _set_color_ramp_stops(
+            color_ramp_main.color_ramp,
+            [0.0, 0.4, 0.7, 1.0],
+            [colors['lava_rock'], colors['weathered_rock'], colors['ash_deposits'],
+             colors.get('fresh_lava', colors['lava_rock'])]
+        )
         
         # === ROUGHNESS SYSTEM ===
         # Base roughness from style profile
@@ -513,90 +1159,38 @@ class VolcanicTerrainGenerator:
         
         # Height-based roughness variation
         roughness_ramp = nodes.new(type='ShaderNodeValToRGB')
-        roughness_elements = roughness_ramp.color_ramp.elements
-        roughness_elements[0].position = 0.0
-        roughness_elements[0].color = (roughness_ranges['smooth_lava'][1], 0, 0, 1)  # Smoother at bottom
-        roughness_elements[1].position = 1.0
-        roughness_elements[1].color = (roughness_ranges['rough_rock'][1], 0, 0, 1)   # Rougher at top
+        _set_color_ramp_stops(
+            roughness_ramp.color_ramp,
+            [0.0, 1.0],
+            [(roughness_ranges['smooth_lava'][1], 0, 0, 1),   # Smoother at bottom
+             (roughness_ranges['rough_rock'][1], 0, 0, 1)]    # Rougher at top
+        )
         
         # === WETNESS SYSTEM ===
         wetness_logic = style['wetness_logic']
         if 'low_areas' in wetness_logic:
             # Height-based wetness
             wetness_ramp = nodes.new(type='ShaderNodeValToRGB')
-            wetness_elements = wetness_ramp.color_ramp.elements
-            wetness_elements[0].position = 0.0
-            wetness_elements[0].color = (wetness_logic['low_areas'], 0, 0, 1)
-            wetness_elements[1].position = 1.0
-            wetness_elements[1].color = (wetness_logic['peaks'], 0, 0, 1)
-        
-        # === TEXTURE MIXING ===
-        # Mix noise textures for surface variation
-        mix_large_medium = nodes.new(type='ShaderNodeMixRGB')
-        mix_large_medium.blend_type = 'MULTIPLY'
-        mix_large_medium.inputs['Fac'].default_value = 0.5
-        
-        mix_final = nodes.new(type='ShaderNodeMixRGB')
-        mix_final.blend_type = 'OVERLAY'
-        mix_final.inputs['Fac'].default_value = 0.3
-        
-        # Mix base color with height variation
-        mix_height_color = nodes.new(type='ShaderNodeMixRGB')
-        mix_height_color.blend_type = 'MULTIPLY'
-        mix_height_color.inputs['Fac'].default_value = 0.8
+            _set_color_ramp_stops(
+                wetness_ramp.color_ramp,
+                [0.0, 1.0],
+                [(wetness_logic['low_areas'], 0, 0, 1), (wetness_logic['peaks'], 0, 0, 1)]
+            )
         
         # === EMISSION FOR VOLCANIC GLOW ===
-        emission_strength = style.get('emission_strength', 0.0)
-        if emission_strength > 0:
-            emission = nodes.new(type='ShaderNodeEmission')
-            emission.inputs['Strength'].default_value = emission_strength
-            emission.inputs['Color'].default_value = colors.get('fresh_lava', (1, 0.3, 0.1, 1))
-            
-            # Mix emission with principled
-            mix_shader = nodes.new(type='ShaderNodeMixShader')
-            mix_shader.inputs['Fac'].default_value = 0.05  # Subtle glow
-            
-        # === NODE CONNECTIONS ===
-        # Texture coordinates
-        links.new(tex_coord.outputs['Generated'], mapping.inputs['Vector'])
-        links.new(mapping.outputs['Vector'], noise_large.inputs['Vector'])
-        links.new(mapping.outputs['Vector'], noise_medium.inputs['Vector'])
-        links.new(mapping.outputs['Vector'], noise_fine.inputs['Vector'])
+        surface.inputs['Emission Color'].default_value = colors.get('fresh_lava', (1, 0.3, 0.1, 1))
+        surface.inputs['Emission Strength'].default_value = style.get('emission_strength', 0.0)
         
+        # === NODE CONNECTIONS ===
         # Height-based systems
         links.new(geometry.outputs['Position'], separate_xyz.inputs['Vector'])
         links.new(separate_xyz.outputs['Z'], color_ramp_main.inputs['Fac'])
         links.new(separate_xyz.outputs['Z'], roughness_ramp.inputs['Fac'])
         
-        # Texture mixing
-        links.new(noise_large.outputs['Color'], mix_large_medium.inputs['Color1'])
-        links.new(noise_medium.outputs['Color'], mix_large_medium.inputs['Color2'])
-        links.new(mix_large_medium.outputs['Color'], mix_final.inputs['Color1'])
-        links.new(noise_fine.outputs['Color'], mix_final.inputs['Color2'])
-        
-        # Final material connections
-        links.new(color_ramp_main.outputs['Color'], mix_height_color.inputs['Color1'])
-        links.new(mix_final.outputs['Color'], mix_height_color.inputs['Color2'])
-        links.new(mix_height_color.outputs['Color'], principled.inputs['Base Color'])
-        
-        # Roughness
-        links.new(roughness_ramp.outputs['Color'], principled.inputs['Roughness'])
-        
-        # Metallic (low for rocks)
-        principled.inputs['Metallic'].default_value = 0.05
-        
-        # Normal mapping from noise
-        normal_map = nodes.new(type='ShaderNodeNormalMap')
-        links.new(mix_final.outputs['Color'], normal_map.inputs['Color'])
-        links.new(normal_map.outputs['Normal'], principled.inputs['Normal'])
-        
-        # Final shader output
-        if emission_strength > 0:
-            links.new(principled.outputs['BSDF'], mix_shader.inputs['Shader'])
-            links.new(emission.outputs['Emission'], mix_shader.inputs['Shader'])
-            links.new(mix_shader.outputs['Shader'], output.inputs['Surface'])
-        else:
-            links.new(principled.outputs['BSDF'], output.inputs['Surface'])
+        # Per-style inputs into the shared surface group
+        links.new(color_ramp_main.outputs['Color'], surface.inputs['Base Color'])
+        links.new(roughness_ramp.outputs['Color'], surface.inputs['Roughness'])
+        links.new(surface.outputs['Shader'], output.inputs['Surface'])
         
         # Assign material to terrain
         if self.terrain_object.data.materials:
@@ -617,12 +1211,22 @@ class VolcanicTerrainGenerator:
         x_step = 200
         y_step = 300
         
-        for i, node in enumerate(nodes):
-            if node.type != 'OUTPUT_MATERIAL':
-                node.location = (x_start + (i % 5) * x_step, y_current - (i // 5) * y_step)
+        # Partition once, then lay out a 5-column grid computed in one pass
+        layout_nodes = []
+        output_node = None
+        for node in nodes:
+            if node.type == 'OUTPUT_MATERIAL':
+                output_node = node
+            else:
+                layout_nodes.append(node)
+        
+        index = np.arange(len(layout_nodes))
+        xs = x_start + (index % 5) * x_step
+        ys = y_current - (index // 5) * y_step
+        for node, x, y in zip(layout_nodes, xs.tolist(), ys.tolist()):
+            node.location = (x, y)
         
         # Position output node at the end
-        output_node = next((n for n in nodes if n.type == 'OUTPUT_MATERIAL'), None)
         if output_node:
             output_node.location = (x_start + 6 * x_step, 0)
     
@@ -635,183 +1239,469 @@ class VolcanicTerrainGenerator:
             return []
         
         scattered_objects = []
-        
-        for asset_info in self.config.asset_catalog:
-            count = self._calculate_asset_count(asset_info)
-            asset_objects = self._scatter_single_asset_type(asset_info, count)
+        self._prepare_scatter_caches()
+        
+        # Restart the stream so scatter is reproducible regardless of earlier RNG consumers
+        self.rng = np.random.default_rng(self.config.config['RNG_SEED'])
+        
+        # One vectorized pass over the whole catalog instead of a per-asset call
+        catalog = self.config.asset_catalog
+        counts = self._calculate_asset_counts(catalog).tolist()
+        
+        # Placement planning is NumPy-only, so asset types are planned concurrently; each gets
+        # its own child stream so results do not depend on thread scheduling
+        seeds = np.random.SeedSequence(self.config.config['RNG_SEED']).spawn(len(catalog))
+        rngs = [np.random.default_rng(seed) for seed in seeds]
+        with ThreadPoolExecutor(max_workers=max(1, min(len(catalog), os.cpu_count() or 1))) as pool:
+            plans = list(pool.map(self._plan_placements, catalog, counts, rngs))
+        
+        # Blender data is only touched from the main thread
+        summary = []
+        total_placed = 0
+        for asset_info, count, matrices in zip(catalog, counts, plans):
+            asset_objects = self._scatter_single_asset_type(asset_info, matrices)
             scattered_objects.extend(asset_objects)
+            placed = len(matrices) if asset_objects else 0
+            total_placed += placed
+            summary.append(f"  {os.path.basename(asset_info['file_path'])}: {placed}/{count} placed")
         
+        # One log call for the whole pass; the headline counts placed instances, not per-type instancers
         self.scattered_objects = scattered_objects
-        logger.info(f"✓ {len(scattered_objects)} assets scattered intelligently")
+        self.scattered_instance_count = total_placed
+        logger.info(f"✓ {total_placed} assets scattered intelligently\n" + "\n".join(summary))
         return scattered_objects
     
-    def _calculate_asset_count(self, asset_info: Dict[str, Any]) -> int:
-        """Calculate how many instances of an asset to place"""
+    def _prepare_scatter_caches(self):
+        """Precompute height and slope rasters once so placement passes only do array lookups"""
+        # Without a baked heightfield (Geometry Nodes preview), rasterize the evaluated surface
+        if self._heightmap is None:
+            self._rasterize_terrain(self.config.config.get('SCATTER_RASTER_RESOLUTION', 512))
+        
+        if self._slope_grid is None:
+            heights = self._heightmap.astype(np.float32) * self._heightmap_scale
+            h00, h10 = heights[:-1, :-1], heights[:-1, 1:]
+            h01, h11 = heights[1:, :-1], heights[1:, 1:]
+            self._cell_height_min = np.minimum(np.minimum(h00, h10), np.minimum(h01, h11))
+            self._cell_height_max = np.maximum(np.maximum(h00, h10), np.maximum(h01, h11))
+            
+            # Bilinear gradients are linear along each axis, so the steepest point is a corner
+            spacing = self._heightmap_spacing
+            grad_x2 = np.maximum((h10 - h00) ** 2, (h11 - h01) ** 2) / spacing ** 2
+            grad_y2 = np.maximum((h01 - h00) ** 2, (h11 - h10) ** 2) / spacing ** 2
+            self._slope_grid = np.degrees(np.arctan(np.sqrt(grad_x2 + grad_y2)))
+    
+    def _invalidate_scatter_caches(self):
+        """Drop cached terrain rasters and BVH after the terrain object is rebuilt"""
+        self._terrain_bvh = None
+        self._cell_height_min = None
+        self._cell_height_max = None
+        self._slope_grid = None
+    
+    def _rasterize_terrain(self, resolution: int):
+        """Ray cast the evaluated terrain on a regular grid into the cached heightmap"""
+        if self._terrain_bvh is None:
+            self._build_terrain_bvh()
+        
+        size = max(self.config.map_size)
+        axis = np.linspace(-size/2, size/2, resolution, dtype=np.float32)
+        grid_x, grid_y = np.meshgrid(axis, axis)
+        
+        # Ray origins and direction moved to object space in one NumPy pass; plain tuples go to the BVH
+        matrix = self._terrain_matrix
+        matrix_inv = self._terrain_matrix_inv
+        origins = np.column_stack([grid_x.ravel(), grid_y.ravel(), np.full(grid_x.size, 1e4)])
+        local_origins = origins @ matrix_inv[:3, :3].T + matrix_inv[:3, 3]
+        direction = tuple(matrix_inv[:3, :3] @ (0.0, 0.0, -1.0))
+        
+        # Only rays inside the terrain's world XY bounding box can hit; the rest are misses up front
+        corners = np.array([tuple(corner) for corner in self.terrain_object.bound_box], dtype=np.float64)
+        world_corners = corners @ matrix[:3, :3].T + matrix[:3, 3]
+        (xmin, ymin), (xmax, ymax) = world_corners[:, :2].min(axis=0), world_corners[:, :2].max(axis=0)
+        in_bounds = np.logical_and.reduce([origins[:, 0] >= xmin, origins[:, 0] <= xmax,
+                                           origins[:, 1] >= ymin, origins[:, 1] <= ymax])
+        
+        # Misses (outside the surface) stay at zero height
+        ray_cast = self._terrain_bvh.ray_cast
+        hits = np.zeros((len(origins), 3), dtype=np.float64)
+        hit_mask = np.zeros(len(origins), dtype=bool)
+        origin_list = local_origins.tolist()
+        for i in np.flatnonzero(in_bounds).tolist():
+            location = ray_cast(origin_list[i], direction)[0]
+            if location is not None:
+                hits[i] = location
+                hit_mask[i] = True
+        
+        world_z = hits @ matrix[2, :3] + matrix[2, 3]
+        heights = np.where(hit_mask, world_z, 0.0).astype(np.float32).reshape(resolution, resolution)
+        
+        self._store_heightmap(heights, size)
+    
+    def _density_factors(self) -> Tuple[float, float]:
+        """Preset density and map-area factor shared by all asset counts"""
         # Base density from preset
-        density_presets = {'Low': 0.5, 'Med': 1.0, 'High': 2.0}
-        base_density = density_presets.get(self.config.config['DENSITY_PRESET'], 1.0)
+        base_density = _DENSITY_PRESETS.get(self.config.config['DENSITY_PRESET'], 1.0)
         
         # Scale with map area
-        map_area = self.config.map_size[0] * self.config.map_size[1]
+        size_x, size_y = self.config.map_size
+        map_area = size_x * size_y
         area_factor = map_area / 10000  # Normalize to 100x100m base
         
-        # Asset-specific density weight
-        density_weight = asset_info.get('density_weight', 1.0)
-        
-        # Calculate final count
-        base_count = max(1, int(15 * base_density * area_factor * density_weight))
+        return base_density, area_factor
+    
+    def _calculate_asset_counts(self, catalog: List[Dict[str, Any]]) -> np.ndarray:
+        """Calculate how many instances of every catalog asset to place"""
+        base_density, area_factor = self._density_factors()
         
-        # Add some randomness
-        variation = random.uniform(0.8, 1.2)
-        final_count = max(1, int(base_count * variation))
+        # Asset-specific density weights with some randomness
+        weights = np.array([a.get('density_weight', 1.0) for a in catalog], dtype=np.float32)
+        variation = self.rng.uniform(0.8, 1.2, size=weights.size)
         
-        return final_count
+        return np.maximum(1, 15 * base_density * area_factor * weights * variation).astype(np.int32)
     
-    def _scatter_single_asset_type(self, asset_info: Dict[str, Any], count: int) -> List[bpy.types.Object]:
-        """Scatter a single asset type with intelligent placement"""
+    def _plan_placements(self, asset_info: Dict[str, Any], count: int,
+                         rng: np.random.Generator) -> Optional[np.ndarray]:
+        """Compute (N, 4, 4) placement matrices for one asset type without touching Blender data"""
         asset_path = asset_info['file_path']
         
         if not os.path.exists(asset_path):
             logger.warning(f"Asset file not found: {asset_path}")
+            return None
+        
+        # Bind per-call state once
+        size_x, size_y = self.config.map_size
+        
+        # Blue-noise candidates filtered by one vectorized rule mask; resample larger if underfilled
+        for oversample in (4, 8):
+            candidates = self._poisson_disk_candidates(count, size_x, size_y, asset_info, rng, oversample)
+            samples = self._batch_sample_terrain(candidates)
+            picks = np.flatnonzero(self._valid_placement_mask(samples, asset_info))[:count]
+            if len(picks) >= count:
+                break
+        
+        placed = len(picks)
+        positions = np.empty((placed, 3), dtype=np.float32)
+        positions[:, :2] = candidates[picks]
+        positions[:, 2] = samples['heights'][picks]
+        normals = samples['normals'][picks]
+        
+        # Random spin and uniform scale for every placement in one call each
+        scale_range = asset_info.get('scale_range', [1.0, 1.0])
+        z_rotations = rng.uniform(0, 2 * math.pi, placed)
+        scales = rng.uniform(scale_range[0], scale_range[1], placed)
+        return _instance_matrices(positions, normals, z_rotations, scales)
+    
+    def _scatter_single_asset_type(self, asset_info: Dict[str, Any],
+                                   matrices: Optional[np.ndarray]) -> List[bpy.types.Object]:
+        """Instantiate one asset type's planned placements in the configured scatter mode"""
+        if matrices is None:
             return []
         
-        scattered = []
-        max_attempts = count * 3  # Allow multiple attempts per asset
-        attempts = 0
-        placed = 0
+        asset_path = asset_info['file_path']
+        scatter_mode = self.config.config.get('SCATTER_MODE', 'INSTANCE')
         
-        # Get terrain bounds
-        size_x, size_y = self.config.map_size
+        # Import the asset only once survivors are known
+        if not len(matrices) or not self._load_asset(asset_path):
+            return []
         
-        while placed < count and attempts < max_attempts:
-            attempts += 1
-            
-            # Generate random position
-            x = random.uniform(-size_x/2 + 5, size_x/2 - 5)  # 5m margin
-            y = random.uniform(-size_y/2 + 5, size_y/2 - 5)
-            
-            # Sample terrain height and properties at this position
-            terrain_data = self._sample_terrain_properties(x, y)
-            
-            if not terrain_data:
-                continue
-            
-            # Check placement rules
-            if not self._is_valid_placement(terrain_data, asset_info):
-                continue
-            
-            # Import and place asset
-            asset_obj = self._import_and_place_asset(asset_path, x, y, terrain_data, asset_info)
-            if asset_obj:
-                scattered.append(asset_obj)
-                placed += 1
+        if scatter_mode == 'LINKED':
+            scattered = self._place_linked_duplicates(self._load_asset(asset_path), asset_info, matrices)
+        elif scatter_mode == 'MERGED':
+            scattered = self._merge_asset_instances(self._load_asset(asset_path), asset_info, matrices)
+        else:
+            asset_collection = self._load_asset_collection(asset_path)
+            scattered = self._instance_asset_collection(asset_collection, asset_info, matrices)
         
-        logger.info(f"✓ Placed {placed}/{count} instances of {os.path.basename(asset_path)}")
         return scattered
     
-    def _sample_terrain_properties(self, x: float, y: float) -> Optional[Dict[str, Any]]:
-        """Sample terrain height, slope, and other properties at a world position"""
-        if not self.terrain_object:
+    def _load_asset(self, asset_path: str) -> List[bpy.types.Object]:
+        """Load the objects of an asset file, reading each file at most once per run"""
+        cached = self._asset_cache.get(asset_path)
+        if cached is not None:
+            return cached
+        
+        asset_objects = []
+        try:
+            if asset_path.lower().endswith('.blend'):
+                with bpy.data.libraries.load(asset_path, link=False) as (data_from, data_to):
+                    data_to.objects = data_from.objects
+                asset_objects = [obj for obj in data_to.objects if obj is not None]
+            else:
+                # glTF has no library loader; import through the operator exactly once
+                # New objects are found by diffing bpy.data, so selection state is never relied on
+                existing = set(bpy.data.objects)
+                bpy.ops.import_scene.gltf(filepath=asset_path)
+                asset_objects = [obj for obj in bpy.data.objects if obj not in existing]
+                for obj in asset_objects:
+                    for collection in obj.users_collection:
+                        collection.objects.unlink(obj)
+        except Exception as e:
+            logger.warning(f"Failed to import asset {asset_path}: {e}")
+        
+        # Park the originals in the hidden templates collection so they keep a user and are never rendered
+        if asset_objects:
+            link_template = self._get_templates_collection().objects.link
+            for obj in asset_objects:
+                link_template(obj)
+        
+        # Failed loads are cached too so catalog entries sharing a file do not retry it
+        self._asset_cache[asset_path] = asset_objects
+        return asset_objects
+    
+    def _get_templates_collection(self) -> bpy.types.Collection:
+        """Scene collection holding loaded asset originals, excluded from the view layer"""
+        if self._templates_collection is None:
+            templates = bpy.data.collections.new("Templates")
+            bpy.context.scene.collection.children.link(templates)
+            bpy.context.view_layer.layer_collection.children[templates.name].exclude = True
+            templates.hide_render = True
+            self._templates_collection = templates
+        return self._templates_collection
+    
+    def _load_asset_collection(self, asset_path: str) -> Optional[bpy.types.Collection]:
+        """Wrap a loaded asset in a template collection used as an instance source"""
+        cached = self._asset_collections.get(asset_path)
+        if cached is not None:
+            return cached
+        
+        asset_objects = self._load_asset(asset_path)
+        if not asset_objects:
             return None
         
-        # Update terrain mesh to get current geometry
-        self.terrain_object.data.update()
+        # Template collection is not linked to the scene; it is only referenced by instances
+        template = bpy.data.collections.new(f"{Path(asset_path).stem}_Template")
+        for obj in asset_objects:
+            template.objects.link(obj)
         
-        # Transform to local coordinates
-        matrix_inv = self.terrain_object.matrix_world.inverted()
-        local_pos = matrix_inv @ Vector((x, y, 0))
+        self._asset_collections[asset_path] = template
+        return template
+    
+    def _create_scatter_collection(self, asset_type: str) -> bpy.types.Collection:
+        """Create a scene collection holding the placements of one asset type"""
+        scatter_collection = bpy.data.collections.new(f"{asset_type}_Scatter")
+        bpy.context.scene.collection.children.link(scatter_collection)
+        return scatter_collection
+    
+    def _create_scatter_root(self, asset_type: str) -> bpy.types.Object:
+        """Create the identity Empty that one asset type's placements are parented under"""
+        # glTF GPU instancing only groups sibling mesh objects under a common parent;
+        # with an identity root each placement's matrix is also its local transform
+        root = bpy.data.objects.new(f"{asset_type}_Instances", None)
+        root.empty_display_type = 'PLAIN_AXES'
+        return root
+    
+    def _instance_asset_collection(self, asset_collection: bpy.types.Collection, asset_info: Dict[str, Any],
+                                   matrices: np.ndarray) -> List[bpy.types.Object]:
+        """Create one collection-instance empty per matrix and bulk-assign their transforms"""
+        asset_type = asset_info.get('type', 'asset')
+        scatter_collection = self._create_scatter_collection(asset_type)
+        root = self._create_scatter_root(asset_type)
+        
+        new_object = bpy.data.objects.new
+        link_object = scatter_collection.objects.link
+        instances = []
+        
+        for i in range(len(matrices)):
+            empty = new_object(f"{asset_type}_{i:03d}", None)
+            empty.empty_display_type = 'PLAIN_AXES'
+            empty.instance_type = 'COLLECTION'
+            empty.instance_collection = asset_collection
+            empty.parent = root
+            link_object(empty)
+            instances.append(empty)
+        
+        _set_world_matrices(scatter_collection.objects, matrices)
+        
+        # Root is linked last so the foreach_set above only covers the placements
+        link_object(root)
+        return [root, *instances]
+    
+    def _place_linked_duplicates(self, asset_objects: List[bpy.types.Object], asset_info: Dict[str, Any],
+                                 matrices: np.ndarray) -> List[bpy.types.Object]:
+        """Place linked duplicates that share the asset's mesh data instead of copying it"""
+        asset_type = asset_info.get('type', 'asset')
+        scatter_collection = self._create_scatter_collection(asset_type)
+        
+        # Only geometry-carrying objects are duplicated; hierarchy is flattened into per-placement matrices
+        sources = [obj for obj in asset_objects if obj.data is not None]
+        if not sources or not len(matrices):
+            return []
+        source_matrices = np.array([np.array(obj.matrix_world) for obj in sources], dtype=np.float32)
+        
+        root = self._create_scatter_root(asset_type)
+        link_object = scatter_collection.objects.link
+        duplicates = []
+        
+        for i in range(len(matrices)):
+            for j, source in enumerate(sources):
+                duplicate = source.copy()
+                duplicate.data = source.data  # Share the mesh datablock
+                duplicate.parent = root
+                duplicate.matrix_parent_inverse.identity()
+                duplicate.name = f"{asset_type}_{i:03d}" if len(sources) == 1 else f"{asset_type}_{i:03d}_{j}"
+                link_object(duplicate)
+                duplicates.append(duplicate)
+        
+        # Placement matrix applied on top of each source object's own world transform
+        world_matrices = (matrices[:, None] @ source_matrices[None]).reshape(-1, 4, 4)
+        _set_world_matrices(scatter_collection.objects, world_matrices)
+        
+        # Root is linked last so the foreach_set above only covers the placements
+        link_object(root)
+        return [root, *duplicates]
+    
+    def _merge_asset_instances(self, asset_objects: List[bpy.types.Object], asset_info: Dict[str, Any],
+                               matrices: np.ndarray) -> List[bpy.types.Object]:
+        """Bake every placement of an asset into a single mesh object (no per-instance selection)"""
+        asset_type = asset_info.get('type', 'asset')
+        scatter_collection = self._create_scatter_collection(asset_type)
+        
+        sources = [obj for obj in asset_objects if obj.type == 'MESH']
+        if not sources or not len(matrices):
+            return []
+        instance_count = len(matrices)
         
-        # Find closest vertex for height sampling
-        mesh = self.terrain_object.data
-        closest_distance = float('inf')
-        closest_height = 0.0
-        closest_normal = Vector((0, 0, 1))
+        co_parts, loop_parts, total_parts, material_parts, uv_parts = [], [], [], [], []
+        materials = []
+        vertex_offset = 0
         
-        for vert in mesh.vertices:
-            world_vert = self.terrain_object.matrix_world @ vert.co
-            distance = ((world_vert.x - x) ** 2 + (world_vert.y - y) ** 2) ** 0.5
+        for source in sources:
+            mesh = source.data
+            vertex_count = len(mesh.vertices)
             
-            if distance < closest_distance:
-                closest_distance = distance
-                closest_height = world_vert.z
-                closest_normal = self.terrain_object.matrix_world.to_3x3() @ vert.normal
-        
-        # Calculate slope from normal
-        slope_angle = math.degrees(math.acos(max(-1, min(1, closest_normal.z))))
+            co = _mesh_verts_np(mesh)
+            loop_verts = _foreach_get_array(mesh.loops, "vertex_index", dtype=np.int32)
+            loop_totals = _foreach_get_array(mesh.polygons, "loop_total", dtype=np.int32)
+            material_index = _foreach_get_array(mesh.polygons, "material_index", dtype=np.int32)
+            if mesh.uv_layers.active:
+                uvs = _foreach_get_array(mesh.uv_layers.active.data, "uv", 2).ravel()
+            else:
+                uvs = np.zeros(len(mesh.loops) * 2, dtype=np.float32)
+            
+            # Placement matrix applied on top of the source object's own world transform
+            world = matrices @ np.array(source.matrix_world, dtype=np.float32)
+            world_co = np.einsum('nij,vj->nvi', world[:, :3, :3], co) + world[:, None, :3, 3]
+            co_parts.append(world_co.reshape(-1, 3))
+            
+            # Each instance's loops point into its own block of transformed vertices
+            instance_offsets = vertex_offset + np.arange(instance_count, dtype=np.int32) * vertex_count
+            loop_parts.append((loop_verts[None, :] + instance_offsets[:, None]).ravel())
+            vertex_offset += instance_count * vertex_count
+            
+            total_parts.append(np.tile(loop_totals, instance_count))
+            material_parts.append(np.tile(material_index + len(materials), instance_count))
+            uv_parts.append(np.tile(uvs, instance_count))
+            materials.extend(mesh.materials)
+        
+        co = np.concatenate(co_parts)
+        loop_verts = np.concatenate(loop_parts)
+        loop_totals = np.concatenate(total_parts)
+        loop_starts = np.zeros_like(loop_totals)
+        np.cumsum(loop_totals[:-1], out=loop_starts[1:])
+        
+        merged = bpy.data.meshes.new(f"{asset_type}_merged")
+        merged.vertices.add(len(co))
+        merged.vertices.foreach_set("co", co.ravel())
+        merged.loops.add(len(loop_verts))
+        merged.loops.foreach_set("vertex_index", loop_verts)
+        merged.polygons.add(len(loop_totals))
+        merged.polygons.foreach_set("loop_start", loop_starts)
+        merged.polygons.foreach_set("material_index", np.concatenate(material_parts))
+        
+        for material in materials:
+            merged.materials.append(material)
+        
+        uv_layer = merged.uv_layers.new(name="UVMap")
+        uv_layer.data.foreach_set("uv", np.concatenate(uv_parts))
+        
+        merged.update(calc_edges=True)
+        
+        merged_object = bpy.data.objects.new(merged.name, merged)
+        scatter_collection.objects.link(merged_object)
+        return [merged_object]
+    
+    def _poisson_disk_candidates(self, count: int, size_x: float, size_y: float,
+                                 asset_info: Dict[str, Any], rng: np.random.Generator,
+                                 oversample: int = 4) -> np.ndarray:
+        """Generate well-spaced candidate XY positions inside the raster cells valid for one asset type"""
+        low = (-size_x/2 + 5, -size_y/2 + 5)  # 5m margin
+        high = (size_x/2 - 5, size_y/2 - 5)
+        
+        # Lower-left corner coordinates of the raster cells
+        rows, cols = self._slope_grid.shape
+        cell = self._heightmap_spacing
+        xs = self._heightmap_origin[0] + np.arange(cols, dtype=np.float32) * cell
+        ys = self._heightmap_origin[1] + np.arange(rows, dtype=np.float32) * cell
+        
+        # A cell is valid when every point in it satisfies the height and slope rules
+        height_range = asset_info.get('height_range', [0, 1000])
+        valid = ((self._cell_height_min >= height_range[0]) & (self._cell_height_max <= height_range[1]) &
+                 (self._slope_grid <= asset_info.get('slope_max', 45)))
+        valid &= (((ys >= low[1]) & (ys + cell <= high[1]))[:, None] &
+                  ((xs >= low[0]) & (xs + cell <= high[0]))[None, :])
+        valid_rows, valid_cols = np.nonzero(valid)
+        if not len(valid_rows):
+            return np.empty((0, 2), dtype=np.float32)
+        
+        # Default spacing leaves room for roughly 4x the requested count within the valid area
+        area = len(valid_rows) * cell * cell
+        spacing = asset_info.get('min_spacing', 0.5 * math.sqrt(area / max(count, 1)))
+        
+        # Uniform over the union of valid cells
+        picks = rng.integers(0, len(valid_rows), size=count * oversample)
+        offsets = rng.uniform(0.0, cell, size=(len(picks), 2))
+        candidates = (np.column_stack([xs[valid_cols[picks]], ys[valid_rows[picks]]]) + offsets).astype(np.float32)
+        return candidates[_poisson_disk_mask(candidates, spacing, rng.random(len(candidates)))]
+    
+    def _batch_sample_terrain(self, points: np.ndarray) -> Dict[str, np.ndarray]:
+        """Sample terrain height, slope and normal for an (N, 2) array of world XY positions"""
+        count = len(points)
+        
+        if self._heightmap is None:
+            self._prepare_scatter_caches()
+        
+        # Points outside the heightfield extent are rejected before the lookup instead of edge-clamped
+        rows, cols = self._heightmap.shape
+        x0, y0 = self._heightmap_origin
+        x1 = x0 + (cols - 1) * self._heightmap_spacing
+        y1 = y0 + (rows - 1) * self._heightmap_spacing
+        found = np.logical_and.reduce([points[:, 0] >= x0, points[:, 0] <= x1,
+                                       points[:, 1] >= y0, points[:, 1] <= y1])
+        
+        heights = np.zeros(count, dtype=np.float32)
+        normals = np.zeros((count, 3), dtype=np.float32)
+        normals[:, 2] = 1.0
+        heights[found], normals[found] = _sample_heightfield(self._heightmap, self._heightmap_origin,
+                                                             self._heightmap_spacing, points[found],
+                                                             self._heightmap_scale)
+        
+        # Slope from normal
+        slopes = np.degrees(np.arccos(np.clip(normals[:, 2], -1.0, 1.0)))
         
         return {
-            'height': closest_height,
-            'slope': slope_angle,
-            'normal': closest_normal,
-            'distance_to_nearest': closest_distance
+            'heights': heights,
+            'slopes': slopes,
+            'normals': normals,
+            'found': found
         }
     
-    def _is_valid_placement(self, terrain_data: Dict[str, Any], asset_info: Dict[str, Any]) -> bool:
-        """Check if an asset can be placed at the given terrain location"""
-        height = terrain_data['height']
-        slope = terrain_data['slope']
-        
-        # Height range check
+    def _build_terrain_bvh(self):
+        """Build a BVH over the evaluated terrain and cache its world transforms once"""
+        # Evaluated object so Geometry Nodes displacement is included; the tree is in object space
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        self._terrain_bvh = BVHTree.FromObject(self.terrain_object, depsgraph)
+        
+        self._terrain_matrix = np.array(self.terrain_object.matrix_world, dtype=np.float64)
+        self._terrain_matrix_inv = np.linalg.inv(self._terrain_matrix)
+    
+    def _valid_placement_mask(self, samples: Dict[str, np.ndarray], asset_info: Dict[str, Any]) -> np.ndarray:
+        """Evaluate placement rules for every sampled candidate at once"""
         height_range = asset_info.get('height_range', [0, 1000])
-        if height < height_range[0] or height > height_range[1]:
-            return False
-        
-        # Slope check
         max_slope = asset_info.get('slope_max', 45)
-        if slope > max_slope:
-            return False
-        
-        # Distance check (don't place too close to mesh boundary)
-        if terrain_data['distance_to_nearest'] > 5.0:  # 5m tolerance
-            return False
+        heights = samples['heights']
         
-        return True
-    
-    def _import_and_place_asset(self, asset_path: str, x: float, y: float, 
-                               terrain_data: Dict[str, Any], asset_info: Dict[str, Any]) -> Optional[bpy.types.Object]:
-        """Import asset and place it on terrain with proper orientation"""
-        try:
-            # Import GLB asset
-            bpy.ops.import_scene.gltf(filepath=asset_path)
-            
-            if not bpy.context.selected_objects:
-                return None
-            
-            asset_obj = bpy.context.selected_objects[0]
-            
-            # Clear selection
-            bpy.ops.object.select_all(action='DESELECT')
-            
-            # Position on terrain
-            height = terrain_data['height']
-            asset_obj.location = (x, y, height)
-            
-            # Orient to terrain normal
-            normal = terrain_data['normal']
-            if normal.length > 0:
-                # Calculate rotation to align with terrain normal
-                up = Vector((0, 0, 1))
-                if abs(normal.dot(up)) < 0.999:  # Avoid gimbal lock
-                    rotation_quat = up.rotation_difference(normal)
-                    asset_obj.rotation_euler = rotation_quat.to_euler()
-            
-            # Random Y rotation for variation
-            asset_obj.rotation_euler.z += random.uniform(0, 2 * math.pi)
-            
-            # Scale variation
-            scale_range = asset_info.get('scale_range', [1.0, 1.0])
-            scale_factor = random.uniform(scale_range[0], scale_range[1])
-            asset_obj.scale = (scale_factor, scale_factor, scale_factor)
-            
-            # Set proper name
-            asset_type = asset_info.get('type', 'asset')
-            asset_obj.name = f"{asset_type}_{len(self.scattered_objects):03d}"
-            
-            return asset_obj
-            
-        except Exception as e:
-            logger.warning(f"Failed to import asset {asset_path}: {e}")
-            return None
+        return (samples['found'] &
+                (heights >= height_range[0]) & (heights <= height_range[1]) &  # Height range check
+                (samples['slopes'] <= max_slope))                               # Slope check
     
     def create_collision_mesh(self):
         """Create optimized collision mesh for game engines"""
@@ -821,29 +1711,49 @@ class VolcanicTerrainGenerator:
         
         logger.info("Creating optimized collision mesh...")
         
-        # Duplicate terrain
+        # Duplicate terrain object; the mesh stays shared until the evaluated result is baked
         collision_obj = self.terrain_object.copy()
-        collision_obj.data = self.terrain_object.data.copy()
         collision_obj.name = f"{self.config.config['PROJECT_NAME']}_Collision"
         
-        # Link to scene
+        # Link to scene so the depsgraph evaluates it
         bpy.context.collection.objects.link(collision_obj)
         
-        # Select collision object
-        bpy.context.view_layer.objects.active = collision_obj
-        bpy.ops.object.select_all(action='DESELECT')
-        collision_obj.select_set(True)
-        
-        # Apply modifiers to get final geometry
-        bpy.ops.object.convert(target='MESH')
-        
-        # Simplify for collision
-        decimate_mod = collision_obj.modifiers.new(name="Decimate", type='DECIMATE')
-        decimate_mod.ratio = 0.25  # Reduce to 25% for performance
-        decimate_mod.decimate_type = 'COLLAPSE'
-        
-        # Apply decimate
-        bpy.ops.object.modifier_apply(modifier="Decimate")
+        optimize_layout = self.config.config.get('OPTIMIZE_MESH_LAYOUT', False)
+        
+        if MESHOPT_AVAILABLE:
+            # Quadric-error simplification of the evaluated triangles for better shape fidelity
+            evaluated = collision_obj.evaluated_get(bpy.context.evaluated_depsgraph_get())
+            mesh = evaluated.to_mesh()
+            try:
+                mesh.calc_loop_triangles()
+                verts = _mesh_verts_np(mesh)
+                triangles = _foreach_get_array(mesh.loop_triangles, "vertices", 3, dtype=np.int32)
+            finally:
+                evaluated.to_mesh_clear()
+            
+            verts, triangles = _simplify_triangles(verts, triangles, 0.25)
+            if optimize_layout:
+                verts, triangles = _optimize_triangle_layout(verts, triangles)
+            collision_obj.data = _mesh_from_faces(collision_obj.name, verts, triangles)
+        else:
+            # Simplify for collision, stacked after any terrain modifiers
+            decimate_mod = collision_obj.modifiers.new(name="Decimate", type='DECIMATE')
+            decimate_mod.ratio = 0.25  # Reduce to 25% for performance
+            decimate_mod.decimate_type = 'COLLAPSE'
+            
+            # Bake the evaluated modifier stack straight into a new mesh, no convert/apply operators
+            depsgraph = bpy.context.evaluated_depsgraph_get()
+            collision_obj.data = bpy.data.meshes.new_from_object(collision_obj.evaluated_get(depsgraph))
+            
+            # Without meshoptimizer, fall back to a Z-order layout of the baked triangles
+            if optimize_layout:
+                baked = collision_obj.data
+                baked.calc_loop_triangles()
+                verts, triangles = _morton_order_layout(
+                    _mesh_verts_np(baked), _foreach_get_array(baked.loop_triangles, "vertices", 3, dtype=np.int32))
+                collision_obj.data = _mesh_from_faces(collision_obj.name, verts, triangles)
+                bpy.data.meshes.remove(baked)
+        collision_obj.modifiers.clear()
         
         # Remove materials from collision mesh
         collision_obj.data.materials.clear()
@@ -860,11 +1770,11 @@ class VolcanicTerrainGenerator:
         output_dir = self.config.output_dir
         project_name = self.config.config['PROJECT_NAME']
         
-        # Ensure all objects are properly positioned and finalized
-        bpy.context.view_layer.update()
+        # Exporters walk only the dedicated export collection instead of the whole scene
+        self._build_export_collection()
         
-        # Select all objects for export
-        bpy.ops.object.select_all(action='SELECT')
+        # Ensure all objects are properly positioned and finalized, once for every format
+        bpy.context.view_layer.update()
         
         exported_files = []
         
@@ -887,28 +1797,88 @@ class VolcanicTerrainGenerator:
         logger.info(f"✓ Exported {len(exported_files)} files: {[f.name for f in exported_files]}")
         return exported_files
     
+    def _build_export_collection(self) -> bpy.types.Collection:
+        """Link terrain, scatter and collision into one collection and make it active"""
+        if self._export_collection is None:
+            export_collection = bpy.data.collections.new("ExportSet")
+            bpy.context.scene.collection.children.link(export_collection)
+            self._export_collection = export_collection
+        
+        export_collection = self._export_collection
+        link_object = export_collection.objects.link
+        members = set(export_collection.objects)
+        for obj in [self.terrain_object, self.collision_object, *self.scattered_objects]:
+            if obj is not None and obj not in members:
+                link_object(obj)
+        
+        view_layer = bpy.context.view_layer
+        view_layer.active_layer_collection = view_layer.layer_collection.children[export_collection.name]
+        return export_collection
+    
     def _export_glb(self, filepath: str):
         """Export GLB with game engine optimization"""
+        # Three.js builds are repacked with meshopt when gltf-transform is installed; Draco is the fallback
+        meshopt_cli = None
+        if self.config.config.get('TARGET_ENGINE') == 'THREE_JS':
+            meshopt_cli = shutil.which('gltf-transform')
+            if meshopt_cli is None:
+                logger.warning("gltf-transform not found, falling back to Draco compression")
+        
+        draco_settings = {} if meshopt_cli else dict(
+            export_draco_mesh_compression_enable=True,  # Compression for web
+            export_draco_mesh_compression_level=6,
+            export_draco_position_quantization=14,  # Positions dominate terrain size
+            export_draco_normal_quantization=10,
+            export_draco_texcoord_quantization=12,
+            export_draco_color_quantization=8,
+            export_draco_generic_quantization=12,
+        )
+        
         bpy.ops.export_scene.gltf(
             filepath=filepath,
             export_format='GLB',
-            use_selection=True,
+            use_selection=False,
+            use_active_collection=True,
             export_materials='EXPORT',
             export_image_format='AUTO',
             export_yup=True,  # Y-up for game engines
             export_apply=True,  # Apply modifiers
             export_texcoords=True,
             export_normals=True,
-            export_draco_mesh_compression_enable=True,  # Compression for web
-            export_draco_mesh_compression_level=6
+            export_gpu_instances=True,  # Applies to sibling meshes sharing data, i.e. LINKED scatter
+            **draco_settings
         )
         logger.info(f"✓ GLB exported to: {filepath}")
+        
+        if meshopt_cli:
+            self._postprocess_glb(filepath, meshopt_cli)
+    
+    def _postprocess_glb(self, filepath: str, cli: str):
+        """Repack a GLB with EXT_meshopt_compression using the gltf-transform CLI"""
+        packed_path = f"{filepath}.meshopt.glb"
+        result = subprocess.run([cli, 'meshopt', filepath, packed_path], capture_output=True, text=True)
+        if result.returncode != 0:
+            logger.warning(f"gltf-transform meshopt failed, GLB left uncompressed: {result.stderr.strip()}")
+            if os.path.exists(packed_path):
+                os.remove(packed_path)
+            return
+        
+        os.replace(packed_path, filepath)
+        logger.info(f"✓ GLB meshopt-compressed: {filepath}")
+    
+    def _warn_instances_flattened(self, format_name: str):
+        """Warn when collection-instanced scatter will be written as independent meshes"""
+        if any(obj.instance_type == 'COLLECTION' for obj in self.scattered_objects):
+            logger.warning(f"{format_name} has no GPU instancing; scattered collection instances "
+                           f"will be exported as independent meshes")
     
     def _export_fbx(self, filepath: str):
         """Export FBX for Unity/Unreal"""
+        self._warn_instances_flattened('FBX')
         bpy.ops.export_scene.fbx(
             filepath=filepath,
-            use_selection=True,
+            use_selection=False,
+            use_active_collection=True,
             apply_modifiers=False,  # Changed parameter name in Blender 4.x
             mesh_smooth_type='FACE',  # Preserve face normals
             use_mesh_edges=False,
@@ -920,6 +1890,14 @@ class VolcanicTerrainGenerator:
     
     def _export_obj(self, filepath: str):
         """Export OBJ as backup format"""
+        self._warn_instances_flattened('OBJ')
+        
+        # OBJ has no collection filter, so select exactly the export set
+        for obj in bpy.context.selected_objects:
+            obj.select_set(False)
+        for obj in self._export_collection.objects:
+            obj.select_set(True)
+        
         bpy.ops.export_scene.obj(
             filepath=filepath,
             use_selection=True,
@@ -950,7 +1928,7 @@ class VolcanicTerrainGenerator:
             
             logger.info("=== Terrain Generation Complete ===")
             logger.info(f"✓ Terrain object: {terrain.name}")
-            logger.info(f"✓ Assets scattered: {len(scattered)}")
+            logger.info(f"✓ Assets scattered: {self.scattered_instance_count}")
             logger.info(f"✓ Collision mesh: {collision.name if collision else 'None'}")
             logger.info(f"✓ Files exported: {len(exported_files)}")
             
@@ -1009,7 +1987,14 @@ def main():
         'MASK_SOURCES': 'Heightfield',
         'EXPORT_FORMATS': ['GLB', 'FBX'],
         'TARGET_ENGINE': 'THREE_JS',
-        'HD_ORTHO_MAP': False
+        'HD_ORTHO_MAP': False,
+        'HEIGHTFIELD_RESOLUTION': 513,
+        'GEOMETRY_NODES_PREVIEW': False,
+        # 'MERGED' (one mesh per asset type), 'INSTANCE' (collection instances) or 'LINKED' (shared-mesh duplicates);
+        # pass --preserve-instances to keep per-instance objects for interactive editing
+        'SCATTER_MODE': 'INSTANCE' if '--preserve-instances' in sys.argv else 'MERGED',
+        'COMPILE_HEIGHTFIELD_KERNEL': False,  # Requires Cython and a C compiler
+        'OPTIMIZE_MESH_LAYOUT': False  # Cache-order terrain/collision meshes (meshoptimizer, else Morton order)
     }
     
     try: